@@ -6,13 +6,65 @@ across different programming languages using NetworkX graphs.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Set, Optional, Any, Union
+from collections import deque
+from typing import List, Dict, Set, Optional, Any, ClassVar, Iterator, Tuple, Union
 from enum import Enum
 import networkx as nx
+import numpy as np
 import json
+import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pure-Python BFS still works
+    njit = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json remains the fallback serializer
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for types to_dict may leave behind (e.g. enums)"""
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _bfs_parents(row_ptr: np.ndarray, col_idx: np.ndarray,
+                 n: int, src: int, tgt: int) -> np.ndarray:
+    """BFS over CSR arrays, returning the parent of each reached node.
+
+    parent[i] == -1 means unreached; parent[src] == src. Stops early once
+    tgt is reached. JIT-compiled with numba when available.
+    """
+    parent = np.full(n, -1, np.int32)
+    queue = np.empty(n, np.int32)
+    head = 0
+    tail = 0
+    queue[tail] = src
+    tail += 1
+    parent[src] = src
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for k in range(row_ptr[u], row_ptr[u + 1]):
+            v = col_idx[k]
+            if parent[v] == -1:
+                parent[v] = u
+                if v == tgt:
+                    return parent
+                queue[tail] = v
+                tail += 1
+    return parent
+
+
+if njit is not None:
+    _bfs_parents = njit(cache=True)(_bfs_parents)
+
 
 class DependencyType(Enum):
     """Types of dependencies between files"""
@@ -35,7 +87,7 @@ class Language(Enum):
     GO = "go"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DependencyStatement:
     """Represents a dependency statement in code (import, using, include, etc.)"""
     target: str                    # What is being imported/used
@@ -43,15 +95,35 @@ class DependencyStatement:
     alias: Optional[str] = None   # Alias if any (e.g., "import numpy as np")
     is_wildcard: bool = False     # True for wildcard imports (e.g., "import *")
     line_number: Optional[int] = None  # Line number in source file
-    
+
+    # Flyweight pool: the same import (e.g. java.util.List) shows up in
+    # thousands of files, so hand out one canonical instance per value
+    _intern_pool: ClassVar[Dict[tuple, 'DependencyStatement']] = {}
+
+    @classmethod
+    def intern(cls, target: str, statement_type: str,
+               alias: Optional[str] = None, is_wildcard: bool = False,
+               line_number: Optional[int] = None) -> 'DependencyStatement':
+        """Return the canonical instance for these field values"""
+        key = (target, statement_type, alias, is_wildcard, line_number)
+        statement = cls._intern_pool.get(key)
+        if statement is None:
+            statement = cls(*key)
+            cls._intern_pool[key] = statement
+        return statement
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
 
 class AbstractFileNode(ABC):
     """Abstract base class for representing a file in any programming language"""
-    
-    def __init__(self, 
+
+    __slots__ = ('file_path', 'file_name', 'language', 'container_name',
+                 'dependency_statements', 'exports', 'metadata',
+                 '_unique_id', '_qualified_name', '_language_str')
+
+    def __init__(self,
                  file_path: str,
                  file_name: str,
                  language: Language,
@@ -68,22 +140,26 @@ class AbstractFileNode(ABC):
         self.file_path = file_path
         self.file_name = file_name
         self.language = language
-        self.container_name = container_name
+        # Interned: many files share a package/module, and ids are used as
+        # dict keys everywhere, so pointer-equality fast paths pay off
+        self.container_name = sys.intern(container_name) if container_name else container_name
         self.dependency_statements: List[DependencyStatement] = []
         self.exports: Set[str] = set()  # What this file exports/provides
-        self.metadata: Dict[str, Any] = {}
-    
+        self.metadata: Optional[Dict[str, Any]] = None  # allocated on first write
+        self._language_str = language.value
+        self._unique_id = sys.intern(f"{language.value}:{file_path}")
+        self._qualified_name = (f"{container_name}.{file_name}"
+                                if container_name else file_name)
+
     @property
     def unique_id(self) -> str:
         """Unique identifier for this file node"""
-        return f"{self.language.value}:{self.file_path}"
-    
+        return self._unique_id
+
     @property
     def qualified_name(self) -> str:
         """Fully qualified name including container"""
-        if self.container_name:
-            return f"{self.container_name}.{self.file_name}"
-        return self.file_name
+        return self._qualified_name
     
     def add_dependency(self, dependency: DependencyStatement) -> None:
         """Add a dependency statement to this file"""
@@ -92,7 +168,21 @@ class AbstractFileNode(ABC):
     def add_export(self, export_name: str) -> None:
         """Add an export/public element from this file"""
         self.exports.add(export_name)
-    
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Attach a metadata entry, allocating the dict on first use"""
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[key] = value
+
+    def freeze(self) -> None:
+        """Convert mutable name sets to frozensets once population is done.
+
+        Frozensets are smaller and read-only; call after parsing when the
+        node enters the analysis phase. Subclasses freeze their own sets.
+        """
+        self.exports = frozenset(self.exports)
+
     @abstractmethod
     def get_language_specific_info(self) -> Dict[str, Any]:
         """Get language-specific information about this file"""
@@ -103,19 +193,21 @@ class AbstractFileNode(ABC):
         return {
             "file_path": self.file_path,
             "file_name": self.file_name,
-            "language": self.language.value,
+            "language": self._language_str,
             "container_name": self.container_name,
-            "qualified_name": self.qualified_name,
+            "qualified_name": self._qualified_name,
             "dependency_statements": [dep.to_dict() for dep in self.dependency_statements],
             "exports": list(self.exports),
-            "metadata": self.metadata,
+            "metadata": self.metadata or {},
             "language_specific": self.get_language_specific_info()
         }
 
 
 class JavaFileNode(AbstractFileNode):
     """Concrete implementation for Java files"""
-    
+
+    __slots__ = ('class_names', 'interface_names', 'access_modifiers')
+
     def __init__(self, file_path: str, file_name: str, package_name: Optional[str] = None):
         super().__init__(file_path, file_name, Language.JAVA, package_name)
         self.class_names: Set[str] = set()
@@ -135,7 +227,12 @@ class JavaFileNode(AbstractFileNode):
         self.access_modifiers[interface_name] = access_modifier
         if access_modifier in ["public", "protected"]:
             self.add_export(interface_name)
-    
+
+    def freeze(self) -> None:
+        super().freeze()
+        self.class_names = frozenset(self.class_names)
+        self.interface_names = frozenset(self.interface_names)
+
     def get_language_specific_info(self) -> Dict[str, Any]:
         return {
             "package_name": self.container_name,
@@ -147,7 +244,9 @@ class JavaFileNode(AbstractFileNode):
 
 class PythonFileNode(AbstractFileNode):
     """Concrete implementation for Python files"""
-    
+
+    __slots__ = ('function_names', 'class_names', 'variable_names', 'is_package_init')
+
     def __init__(self, file_path: str, file_name: str, module_name: Optional[str] = None):
         super().__init__(file_path, file_name, Language.PYTHON, module_name)
         self.function_names: Set[str] = set()
@@ -166,7 +265,13 @@ class PythonFileNode(AbstractFileNode):
         self.class_names.add(class_name)
         if not is_private and not class_name.startswith('_'):
             self.add_export(class_name)
-    
+
+    def freeze(self) -> None:
+        super().freeze()
+        self.function_names = frozenset(self.function_names)
+        self.class_names = frozenset(self.class_names)
+        self.variable_names = frozenset(self.variable_names)
+
     def get_language_specific_info(self) -> Dict[str, Any]:
         return {
             "module_name": self.container_name,
@@ -179,7 +284,9 @@ class PythonFileNode(AbstractFileNode):
 
 class CSharpFileNode(AbstractFileNode):
     """Concrete implementation for C# files"""
-    
+
+    __slots__ = ('class_names', 'interface_names', 'struct_names', 'access_modifiers')
+
     def __init__(self, file_path: str, file_name: str, namespace: Optional[str] = None):
         super().__init__(file_path, file_name, Language.CSHARP, namespace)
         self.class_names: Set[str] = set()
@@ -193,7 +300,13 @@ class CSharpFileNode(AbstractFileNode):
         self.access_modifiers[class_name] = access_modifier
         if access_modifier == "public":
             self.add_export(class_name)
-    
+
+    def freeze(self) -> None:
+        super().freeze()
+        self.class_names = frozenset(self.class_names)
+        self.interface_names = frozenset(self.interface_names)
+        self.struct_names = frozenset(self.struct_names)
+
     def get_language_specific_info(self) -> Dict[str, Any]:
         return {
             "namespace": self.container_name,
@@ -204,7 +317,7 @@ class CSharpFileNode(AbstractFileNode):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DependencyLink:
     """Represents a dependency link between two file nodes"""
     source_node_id: str
@@ -212,12 +325,8 @@ class DependencyLink:
     dependency_type: DependencyType
     dependency_statements: List[DependencyStatement]
     weight: float = 1.0  # Strength of dependency
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-    
+    metadata: Optional[Dict[str, Any]] = None  # allocated only when used
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "source_node_id": self.source_node_id,
@@ -225,7 +334,7 @@ class DependencyLink:
             "dependency_type": self.dependency_type.value,
             "dependency_statements": [stmt.to_dict() for stmt in self.dependency_statements],
             "weight": self.weight,
-            "metadata": self.metadata
+            "metadata": self.metadata or {}
         }
 
 
@@ -238,104 +347,350 @@ class CodeDependencyGraph:
         self.nodes: Dict[str, AbstractFileNode] = {}
         self.links: Dict[str, DependencyLink] = {}  # edge_id -> DependencyLink
         self.metadata: Dict[str, Any] = {}
-    
+        # Attribute indexes so filtering is O(matches), not O(all nodes/links)
+        self._nodes_by_language: Dict[Language, Set[str]] = {}
+        # Buckets keyed by edge_id so last-write-wins overwrites in
+        # self.links replace (not accumulate) here as well
+        self._links_by_type: Dict[DependencyType, Dict[str, DependencyLink]] = {}
+        # Lazily built CSR adjacency (forward and reverse) over integer node
+        # indices.  Neighbor queries become contiguous int32 slices instead of
+        # Python-level dict walks; rebuilt on demand after mutation.
+        self._csr_dirty = True
+        self._version = 0  # bumped on every mutation; keys the caches below
+        self._metrics_cache: Optional[Dict[str, Any]] = None
+        self._cycles_cache: Optional[Tuple[int, List[List[str]]]] = None
+        self._id_to_idx: Dict[str, int] = {}
+        self._idx_to_id: List[str] = []
+        self._row_ptr: Optional[np.ndarray] = None
+        self._col_idx: Optional[np.ndarray] = None
+        self._rev_row_ptr: Optional[np.ndarray] = None
+        self._rev_col_idx: Optional[np.ndarray] = None
+
+    def _invalidate(self) -> None:
+        """Mark derived structures stale after a mutation"""
+        self._csr_dirty = True
+        self._version += 1
+        self._metrics_cache = None
+
+    def _build_csr(self) -> None:
+        """(Re)build the CSR adjacency arrays from self.links"""
+        self._id_to_idx = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self._idx_to_id = list(self.nodes)
+        n = len(self._idx_to_id)
+
+        if self.links:
+            src = np.fromiter(
+                (self._id_to_idx[link.source_node_id] for link in self.links.values()),
+                dtype=np.int32, count=len(self.links))
+            tgt = np.fromiter(
+                (self._id_to_idx[link.target_node_id] for link in self.links.values()),
+                dtype=np.int32, count=len(self.links))
+        else:
+            src = np.empty(0, dtype=np.int32)
+            tgt = np.empty(0, dtype=np.int32)
+
+        # Forward adjacency: sort edges by source, prefix-sum the out-degrees
+        order = np.argsort(src, kind='stable')
+        self._col_idx = tgt[order]
+        self._row_ptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self._row_ptr[1:])
+
+        # Reverse adjacency: same construction with edges flipped
+        order = np.argsort(tgt, kind='stable')
+        self._rev_col_idx = src[order]
+        self._rev_row_ptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(tgt, minlength=n), out=self._rev_row_ptr[1:])
+
+        self._csr_dirty = False
+
+    def _ensure_csr(self) -> None:
+        if self._csr_dirty:
+            self._build_csr()
+
     def add_node(self, file_node: AbstractFileNode) -> None:
         """Add a file node to the graph"""
         node_id = file_node.unique_id
         self.nodes[node_id] = file_node
-        
-        # Add to NetworkX graph with node attributes
-        self.graph.add_node(node_id, 
-                           file_path=file_node.file_path,
-                           file_name=file_node.file_name,
-                           language=file_node.language.value,
-                           container_name=file_node.container_name,
-                           qualified_name=file_node.qualified_name,
-                           exports=list(file_node.exports))
-    
-    def add_link(self, link: DependencyLink) -> None:
-        """Add a dependency link between nodes"""
-        if link.source_node_id not in self.nodes:
-            raise ValueError(f"Source node {link.source_node_id} not found")
-        if link.target_node_id not in self.nodes:
-            raise ValueError(f"Target node {link.target_node_id} not found")
-        
-        edge_id = f"{link.source_node_id}->{link.target_node_id}"
+        self._nodes_by_language.setdefault(file_node.language, set()).add(node_id)
+
+        # The NetworkX graph only carries topology; all node attributes live
+        # on the AbstractFileNode in self.nodes (no duplicated storage)
+        self.graph.add_node(node_id)
+        self._invalidate()
+
+    def _add_link_core(self, link: DependencyLink, edge_id: str) -> None:
+        """Insert a link whose endpoints are already known to exist"""
+        old = self.links.get(edge_id)
+        if old is not None and old.dependency_type is not link.dependency_type:
+            self._links_by_type[old.dependency_type].pop(edge_id, None)
         self.links[edge_id] = link
-        
+        self._links_by_type.setdefault(link.dependency_type, {})[edge_id] = link
+
         # Add to NetworkX graph with edge attributes
         self.graph.add_edge(link.source_node_id, link.target_node_id,
                            dependency_type=link.dependency_type.value,
                            weight=link.weight,
                            edge_id=edge_id)
-    
+        self._invalidate()
+
+    def add_link(self, link: DependencyLink) -> None:
+        """Add a dependency link between nodes"""
+        if link.source_node_id not in self.nodes:
+            raise ValueError(f"Source node {link.source_node_id} not found")
+        if link.target_node_id not in self.nodes:
+            raise ValueError(f"Target node {link.target_node_id} not found")
+
+        edge_id = sys.intern(f"{link.source_node_id}->{link.target_node_id}")
+        self._add_link_core(link, edge_id)
+
+    def add_link_unchecked(self, link: DependencyLink) -> None:
+        """Add a link without endpoint validation.
+
+        Fast path for bulk builds (loaders, parsers) where both endpoints
+        are guaranteed to be present already.
+        """
+        edge_id = sys.intern(f"{link.source_node_id}->{link.target_node_id}")
+        self._add_link_core(link, edge_id)
+
     def get_dependencies(self, node_id: str) -> List[str]:
         """Get all dependencies (outgoing edges) for a node"""
-        return list(self.graph.successors(node_id))
-    
+        self._ensure_csr()
+        i = self._id_to_idx[node_id]
+        return [self._idx_to_id[j]
+                for j in self._col_idx[self._row_ptr[i]:self._row_ptr[i + 1]]]
+
     def get_dependents(self, node_id: str) -> List[str]:
         """Get all dependents (incoming edges) for a node"""
-        return list(self.graph.predecessors(node_id))
+        self._ensure_csr()
+        i = self._id_to_idx[node_id]
+        return [self._idx_to_id[j]
+                for j in self._rev_col_idx[self._rev_row_ptr[i]:self._rev_row_ptr[i + 1]]]
     
     def get_dependency_path(self, source_id: str, target_id: str) -> Optional[List[str]]:
         """Find dependency path between two nodes"""
-        try:
-            return nx.shortest_path(self.graph, source_id, target_id)
-        except nx.NetworkXNoPath:
+        self._ensure_csr()
+        src = self._id_to_idx[source_id]
+        tgt = self._id_to_idx[target_id]
+        if src == tgt:
+            return [source_id]
+
+        parent = _bfs_parents(self._row_ptr, self._col_idx,
+                              len(self._idx_to_id), src, tgt)
+        if parent[tgt] == -1:
             return None
-    
-    def detect_cycles(self) -> List[List[str]]:
-        """Detect circular dependencies"""
-        try:
-            cycles = list(nx.simple_cycles(self.graph))
-            return cycles
-        except:
+
+        path = [tgt]
+        u = tgt
+        while u != src:
+            u = int(parent[u])
+            path.append(u)
+        path.reverse()
+        return [self._idx_to_id[i] for i in path]
+    
+    def _sparse_adjacency(self):
+        """Build a boolean scipy CSR matrix over the integer node indices"""
+        from scipy.sparse import csr_matrix
+
+        self._ensure_csr()
+        n = len(self._idx_to_id)
+        return csr_matrix(
+            (np.ones(self._col_idx.size, dtype=bool), self._col_idx, self._row_ptr),
+            shape=(n, n))
+
+    def _cyclic_labels(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """SCC labels per node plus a per-component 'is cyclic' mask.
+
+        A component is cyclic when it has more than one member or its single
+        member carries a self-loop. Returns None on an empty graph.
+        """
+        from scipy.sparse.csgraph import connected_components
+
+        self._ensure_csr()
+        n = len(self._idx_to_id)
+        if n == 0:
+            return None
+
+        n_scc, labels = connected_components(self._sparse_adjacency(),
+                                             directed=True, connection='strong')
+        sizes = np.bincount(labels, minlength=n_scc)
+        edge_src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self._row_ptr))
+        self_loop_nodes = edge_src[edge_src == self._col_idx]
+        cyclic = sizes > 1
+        cyclic[labels[self_loop_nodes]] = True
+        return labels, cyclic
+
+    def _cyclic_components(self) -> List[np.ndarray]:
+        """Node-index groups for each cyclic SCC (size > 1 or self-loop)"""
+        labelled = self._cyclic_labels()
+        if labelled is None:
             return []
-    
+        labels, cyclic = labelled
+        return [np.nonzero(labels == comp)[0] for comp in np.nonzero(cyclic)[0]]
+
+    def has_cycle(self) -> bool:
+        """Check whether the graph contains any circular dependency.
+
+        Presence-only test: reads the cyclic-component mask directly without
+        materializing the member index arrays detect_cycles needs.
+        """
+        labelled = self._cyclic_labels()
+        return labelled is not None and bool(labelled[1].any())
+
+    def iter_cycles(self) -> Iterator[List[str]]:
+        """Yield one representative cycle per cyclic strongly connected
+        component, lazily.
+
+        Consumers that only need a few cycles (or aggregate statistics over
+        their lengths) can stream them without materializing every member
+        path up front; detect_cycles wraps this in a cached list.
+        """
+        for comp in self._cyclic_components():
+            start = int(comp[0])
+            if len(comp) == 1:
+                yield [self._idx_to_id[start]]  # self-loop
+                continue
+
+            # BFS within the component until an edge leads back to start
+            members = set(comp.tolist())
+            parent = {start: -1}
+            queue = deque([start])
+            closing_node = None
+            while queue and closing_node is None:
+                u = queue.popleft()
+                for v in self._col_idx[self._row_ptr[u]:self._row_ptr[u + 1]]:
+                    v = int(v)
+                    if v == start:
+                        closing_node = u
+                        break
+                    if v in members and v not in parent:
+                        parent[v] = u
+                        queue.append(v)
+
+            path = []
+            u = closing_node
+            while u != -1:
+                path.append(u)
+                u = parent[u]
+            path.reverse()
+            yield [self._idx_to_id[i] for i in path]
+
+    def detect_cycles(self) -> List[List[str]]:
+        """Detect circular dependencies.
+
+        Returns one representative cycle per cyclic strongly connected
+        component rather than enumerating every elementary cycle, which is
+        exponential in the worst case. Runs in O(V+E); the result is cached
+        against the mutation counter, like calculate_metrics.
+        """
+        if self._cycles_cache is not None and self._cycles_cache[0] == self._version:
+            return self._cycles_cache[1]
+
+        cycles = list(self.iter_cycles())
+        self._cycles_cache = (self._version, cycles)
+        return cycles
+
     def get_strongly_connected_components(self) -> List[List[str]]:
         """Get strongly connected components (circular dependency groups)"""
         return list(nx.strongly_connected_components(self.graph))
     
     def calculate_metrics(self) -> Dict[str, Any]:
-        """Calculate various graph metrics"""
-        return {
-            "num_nodes": self.graph.number_of_nodes(),
-            "num_edges": self.graph.number_of_edges(),
-            "density": nx.density(self.graph),
-            "is_dag": nx.is_directed_acyclic_graph(self.graph),
-            "num_weakly_connected_components": nx.number_weakly_connected_components(self.graph),
-            "num_strongly_connected_components": nx.number_strongly_connected_components(self.graph),
-            "cycles": len(self.detect_cycles())
+        """Calculate various graph metrics in one pass over the CSR arrays.
+
+        Results are cached until the graph is mutated again.
+        """
+        from scipy.sparse.csgraph import connected_components
+
+        if self._metrics_cache is not None:
+            return self._metrics_cache
+
+        self._ensure_csr()
+        n = len(self._idx_to_id)
+        nnz = int(self._col_idx.size)
+
+        if n == 0:
+            self._metrics_cache = {
+                "num_nodes": 0,
+                "num_edges": 0,
+                "density": 0.0,
+                "is_dag": True,
+                "num_weakly_connected_components": 0,
+                "num_strongly_connected_components": 0,
+                "cycles": 0
+            }
+            return self._metrics_cache
+
+        adjacency = self._sparse_adjacency()
+        n_scc, scc_labels = connected_components(adjacency, directed=True,
+                                                 connection='strong')
+        n_wcc, _ = connected_components(adjacency, directed=False)
+
+        # SCCs with more than one member are exactly the cyclic groups; a
+        # self-loop makes a one-node SCC cyclic as well.
+        scc_sizes = np.bincount(scc_labels, minlength=n_scc)
+        edge_src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self._row_ptr))
+        self_loop_nodes = edge_src[edge_src == self._col_idx]
+        cyclic_scc_mask = scc_sizes > 1
+        cyclic_scc_mask[scc_labels[self_loop_nodes]] = True
+        num_cyclic_sccs = int(cyclic_scc_mask.sum())
+
+        self._metrics_cache = {
+            "num_nodes": n,
+            "num_edges": nnz,
+            "density": nnz / (n * (n - 1)) if n > 1 else 0.0,
+            "is_dag": num_cyclic_sccs == 0,
+            "num_weakly_connected_components": int(n_wcc),
+            "num_strongly_connected_components": int(n_scc),
+            "cycles": num_cyclic_sccs
         }
+        return self._metrics_cache
     
+    def freeze(self) -> None:
+        """Freeze every node's name sets for the read-heavy analysis phase"""
+        for node in self.nodes.values():
+            node.freeze()
+
+    def _adopt(self, nodes: Dict[str, AbstractFileNode],
+               links: Dict[str, DependencyLink], nx_graph: nx.DiGraph) -> None:
+        """Bulk-populate this graph from pre-validated pieces of a parent.
+
+        Skips the per-element add_node/add_link paths (and their membership
+        checks) since the caller guarantees consistency.
+        """
+        self.nodes = nodes
+        self.links = links
+        self.graph = nx_graph
+        for node_id, node in nodes.items():
+            self._nodes_by_language.setdefault(node.language, set()).add(node_id)
+        for edge_id, link in links.items():
+            self._links_by_type.setdefault(link.dependency_type, {})[edge_id] = link
+        self._invalidate()
+
     def filter_by_language(self, language: Language) -> 'CodeDependencyGraph':
         """Create a subgraph containing only nodes of specified language"""
         filtered_graph = CodeDependencyGraph(f"{self.name}_{language.value}")
-        
-        for node_id, node in self.nodes.items():
-            if node.language == language:
-                filtered_graph.add_node(node)
-        
-        for link in self.links.values():
-            if (link.source_node_id in filtered_graph.nodes and 
-                link.target_node_id in filtered_graph.nodes):
-                filtered_graph.add_link(link)
-        
+
+        node_ids = self._nodes_by_language.get(language, set())
+        nodes = {node_id: self.nodes[node_id] for node_id in node_ids}
+        links = {edge_id: link for edge_id, link in self.links.items()
+                 if link.source_node_id in node_ids and link.target_node_id in node_ids}
+        # The induced subgraph already restricts edges to surviving nodes
+        filtered_graph._adopt(nodes, links, self.graph.subgraph(node_ids).copy())
         return filtered_graph
-    
+
     def filter_by_dependency_type(self, dep_type: DependencyType) -> 'CodeDependencyGraph':
         """Create a subgraph containing only specified dependency types"""
         filtered_graph = CodeDependencyGraph(f"{self.name}_{dep_type.value}")
-        
-        # Add all nodes
-        for node in self.nodes.values():
-            filtered_graph.add_node(node)
-        
-        # Add only links of specified type
-        for link in self.links.values():
-            if link.dependency_type == dep_type:
-                filtered_graph.add_link(link)
-        
+
+        links = dict(self._links_by_type.get(dep_type, {}))
+        nx_graph = nx.DiGraph()
+        nx_graph.add_nodes_from(self.graph.nodes())
+        nx_graph.add_edges_from(
+            (link.source_node_id, link.target_node_id,
+             {"dependency_type": link.dependency_type.value,
+              "weight": link.weight,
+              "edge_id": edge_id})
+            for edge_id, link in links.items())
+        filtered_graph._adopt(dict(self.nodes), links, nx_graph)
         return filtered_graph
     
     def to_dict(self) -> Dict[str, Any]:
@@ -349,20 +704,56 @@ class CodeDependencyGraph:
         }
     
     def save_to_json(self, file_path: str) -> None:
-        """Save graph to JSON file"""
+        """Save graph to JSON file.
+
+        Uses orjson (C-level encoding) when installed; otherwise streams one
+        node/link at a time so peak memory stays flat on large graphs.
+        """
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(self.to_dict(), default=_json_default,
+                                     option=orjson.OPT_INDENT_2))
+            return
+
         with open(file_path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+            write = f.write
+            dumps = json.dumps
+            write('{"name": ')
+            write(dumps(self.name))
+            write(', "metadata": ')
+            write(dumps(self.metadata))
+            write(', "nodes": {')
+            for i, (node_id, node) in enumerate(self.nodes.items()):
+                if i:
+                    write(', ')
+                write(dumps(node_id))
+                write(': ')
+                write(dumps(node.to_dict()))
+            write('}, "links": {')
+            for i, (edge_id, link) in enumerate(self.links.items()):
+                if i:
+                    write(', ')
+                write(dumps(edge_id))
+                write(': ')
+                write(dumps(link.to_dict()))
+            write('}, "metrics": ')
+            write(dumps(self.calculate_metrics()))
+            write('}')
     
     @classmethod
     def load_from_json(cls, file_path: str) -> 'CodeDependencyGraph':
         """Load graph from JSON file"""
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(Path(file_path).read_bytes())
+        else:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
         
         graph = cls(data["name"])
         graph.metadata = data.get("metadata", {})
-        
-        # Recreate nodes
+
+        # Recreate nodes, collecting them for one bulk insert at the end
+        nodes: Dict[str, AbstractFileNode] = {}
         for node_data in data["nodes"].values():
             language = Language(node_data["language"])
             
@@ -383,30 +774,50 @@ class CodeDependencyGraph:
                 # Fallback - would need to implement for other languages
                 continue
             
-            # Restore dependency statements
+            # Restore dependency statements through the flyweight pool
             for dep_data in node_data["dependency_statements"]:
-                dep = DependencyStatement(**dep_data)
-                node.add_dependency(dep)
+                node.add_dependency(DependencyStatement.intern(**dep_data))
             
             # Restore exports
             for export in node_data["exports"]:
                 node.add_export(export)
-            
-            graph.add_node(node)
-        
-        # Recreate links
+
+            nodes[node.unique_id] = node
+
+        # Recreate links; a single membership check against the node-id set
+        # replaces the two per-call lookups add_link would do
+        links: Dict[str, DependencyLink] = {}
         for link_data in data["links"].values():
-            statements = [DependencyStatement(**stmt) for stmt in link_data["dependency_statements"]]
+            statements = [DependencyStatement.intern(**stmt)
+                          for stmt in link_data["dependency_statements"]]
             link = DependencyLink(
                 source_node_id=link_data["source_node_id"],
                 target_node_id=link_data["target_node_id"],
                 dependency_type=DependencyType(link_data["dependency_type"]),
                 dependency_statements=statements,
                 weight=link_data["weight"],
-                metadata=link_data["metadata"]
+                metadata=link_data["metadata"] or None
             )
-            graph.add_link(link)
-        
+            # Same error contract as add_link: a link referencing a node
+            # absent from the file is corrupt input, not something to skip
+            if link.source_node_id not in nodes:
+                raise ValueError(f"Source node {link.source_node_id} not found")
+            if link.target_node_id not in nodes:
+                raise ValueError(f"Target node {link.target_node_id} not found")
+            edge_id = sys.intern(f"{link.source_node_id}->{link.target_node_id}")
+            links[edge_id] = link
+
+        # Bulk insert through NetworkX's add_*_from paths
+        nx_graph = nx.DiGraph()
+        nx_graph.add_nodes_from(nodes)
+        nx_graph.add_edges_from(
+            (link.source_node_id, link.target_node_id,
+             {"dependency_type": link.dependency_type.value,
+              "weight": link.weight,
+              "edge_id": edge_id})
+            for edge_id, link in links.items())
+        graph._adopt(nodes, links, nx_graph)
+
         return graph
 
 
@@ -2,6 +2,8 @@
 Example usage of the Code Migration Graphs framework
 """
 
+from collections import Counter
+
 from codegraphs import (
     CodeDependencyGraph, JavaFileNode, PythonFileNode, CSharpFileNode,
     DependencyStatement, DependencyLink, DependencyType, Language
@@ -130,7 +132,7 @@ def demo_dependency_analysis():
         print(f"Loaded sample codebase: {graph.name}")
         
         # Find all dependencies for a specific file
-        sample_node_id = list(graph.nodes.keys())[0]
+        sample_node_id = next(iter(graph.nodes))
         sample_node = graph.nodes[sample_node_id]
         
         print(f"\nAnalyzing dependencies for: {sample_node.file_name}")
@@ -161,11 +163,9 @@ def demo_dependency_analysis():
         
         # Package analysis
         print(f"\n=== Package Analysis ===")
-        packages = {}
-        for node in graph.nodes.values():
-            pkg = node.container_name or "default"
-            packages[pkg] = packages.get(pkg, 0) + 1
-        
+        packages = Counter(node.container_name or "default"
+                           for node in graph.nodes.values())
+
         for package, count in sorted(packages.items()):
             print(f"  {package}: {count} files")
         
@@ -3,6 +3,9 @@ Generate sample Java codebase data for testing the code dependency graph framewo
 """
 
 import random
+
+import numpy as np
+
 from codegraphs import (
     CodeDependencyGraph, JavaFileNode, DependencyStatement, DependencyLink, 
     DependencyType, Language
@@ -67,11 +70,19 @@ def generate_sample_java_codebase():
         ("D.java", "G.java", ["StringUtils"]),  # D depends on G
     ]
     
+    # Presample every line number in one vectorized draw (seeded from the
+    # global random state so runs stay reproducible); the loops below just
+    # consume them with a running offset
+    rng = np.random.default_rng(random.getrandbits(64))
+    total_imports = sum(len(classes) for _, _, classes in intrinsic_dependencies)
+    intrinsic_lines = rng.integers(1, 11, size=total_imports)
+    line_pos = 0
+
     # Add intrinsic dependency links
     for source_file, target_file, imported_classes in intrinsic_dependencies:
         source_node = nodes[source_file]
         target_node = nodes[target_file]
-        
+
         # Create dependency statements
         statements = []
         for class_name in imported_classes:
@@ -79,8 +90,9 @@ def generate_sample_java_codebase():
             stmt = DependencyStatement(
                 target=full_class_name,
                 statement_type="import",
-                line_number=random.randint(1, 10)
+                line_number=int(intrinsic_lines[line_pos])
             )
+            line_pos += 1
             statements.append(stmt)
             source_node.add_dependency(stmt)
         
@@ -112,18 +124,22 @@ def generate_sample_java_codebase():
         "lombok.AllArgsConstructor"
     ]
     
-    # Add external dependencies randomly
-    for filename, node in nodes.items():
-        # Each file gets 2-5 external dependencies
-        num_external_deps = random.randint(2, 5)
-        selected_externals = random.sample(external_libraries, num_external_deps)
-        
-        for external_dep in selected_externals:
+    # Add external dependencies randomly: the per-file dep counts and all
+    # line numbers come from batched draws, and rng.choice replaces
+    # random.sample's Python-level Fisher-Yates per file
+    deps_per_file = rng.integers(2, 6, size=len(nodes))  # each file gets 2-5
+    external_lines = rng.integers(1, 16, size=int(deps_per_file.sum()))
+    line_pos = 0
+    for (filename, node), num_external_deps in zip(nodes.items(), deps_per_file.tolist()):
+        selected = rng.choice(len(external_libraries), size=num_external_deps,
+                              replace=False)
+        for lib_idx in selected.tolist():
             stmt = DependencyStatement(
-                target=external_dep,
+                target=external_libraries[lib_idx],
                 statement_type="import",
-                line_number=random.randint(1, 15)
+                line_number=int(external_lines[line_pos])
             )
+            line_pos += 1
             node.add_dependency(stmt)
     
     return graph
@@ -132,13 +148,15 @@ def generate_sample_java_codebase():
 def add_some_circular_dependencies(graph: CodeDependencyGraph):
     """Add a few circular dependencies to make the graph more interesting"""
     
-    # Get some nodes for creating cycles
-    node_ids = list(graph.nodes.keys())
-    
-    if len(node_ids) >= 3:
+    # Index nodes by file name once; filenames are unique in the generated
+    # codebase, so the lookups below are O(1) instead of substring scans
+    # over every node id
+    by_filename = {node.file_name: nid for nid, node in graph.nodes.items()}
+
+    if len(by_filename) >= 3:
         # Create a small cycle: G -> H -> G (utility classes depending on each other)
-        g_node_id = next((nid for nid in node_ids if "G.java" in nid), None)
-        h_node_id = next((nid for nid in node_ids if "H.java" in nid), None)
+        g_node_id = by_filename.get("G.java")
+        h_node_id = by_filename.get("H.java")
         
         if g_node_id and h_node_id:
             # G depends on H (already exists), now add H depends on G
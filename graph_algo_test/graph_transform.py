@@ -2,12 +2,26 @@
 """Dependency-graph transformer (parents = in-edges)."""
 
 from __future__ import annotations
-import random, re, string
-from collections import defaultdict, deque
+import io
+import random, re, string, sys
+from array import array
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pprint import pprint
 from typing import Dict, List, Tuple
 import networkx as nx
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 ###############################################################################
 # ─── helpers ─────────────────────────────────────────────────────────────────
@@ -16,15 +30,50 @@ import networkx as nx
 class NodeData:
     name: str
     n_transforms: int = 0
-    history: List[str] = field(default_factory=list)           # ["A0→a1", …]
-    parent_history: List[List[Tuple[str, str]]] = field(default_factory=list)
+    # History as SoA: per step, the numeric suffix *before* the bump plus a
+    # packed case byte (bit0 = alpha upper before, bit1 = alpha upper after).
+    # "A0→a1"-style strings are only materialized in dump().
+    history_num: array = field(default_factory=lambda: array('i'))
+    history_case: bytearray = field(default_factory=bytearray)
+    # One (parent_ids, parent_states) int32 pair per transform pass, where
+    # state packs the parent's name at record time as num*2 | upper
+    parent_history: List[Tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
 
 _pat = re.compile(r"([A-Za-z]+)(\d+)")
 def bump(old: str) -> str:
+    """Single-name bump, kept for API parity; transform uses _bump_layer."""
     alpha, num = _pat.fullmatch(old).groups()
     alpha = alpha.upper() if random.random() < .5 else alpha.lower()
     return f"{alpha}{int(num)+1}"
 
+
+def _bump_layer_py(idxs, num, alpha_upper, n_transforms, rand_u):
+    # pure-arithmetic core of a layer bump over the SoA state arrays;
+    # compiled to a parallel native loop below when numba is available
+    for k in range(idxs.size):
+        i = idxs[k]
+        num[i] += 1
+        alpha_upper[i] = 1 if rand_u[k] < 0.5 else 0
+        n_transforms[i] += 1
+
+if njit is not None:
+    from numba import prange
+
+    # nodes within a layer are independent (build_levels never repeats a
+    # canon id inside one level), so the layer can be bumped with prange;
+    # levels themselves stay sequential — level k+1 depends on k
+    @njit(parallel=True, cache=True)
+    def _bump_layer(idxs, num, alpha_upper, n_transforms, rand_u):
+        for k in prange(idxs.size):
+            i = idxs[k]
+            num[i] += 1
+            alpha_upper[i] = 1 if rand_u[k] < 0.5 else 0
+            n_transforms[i] += 1
+else:
+    # the plain-Python path stays serial: under the GIL, threading this
+    # small-int arithmetic only adds overhead
+    _bump_layer = _bump_layer_py
+
 def nth(i: int) -> str:                         # A0, B0, … Z0, AA0, …
     s = ""
     while True:
@@ -33,10 +82,104 @@ def nth(i: int) -> str:                         # A0, B0, … Z0, AA0, …
         if i == 0: break
     return f"{s}0"
 
+# Aliases are (canon_id, k) int pairs internally — no string splitting in the
+# hot loops; only the printers build the "B0_3"-style display form.
+Alias = Tuple[int, int]
+
+def alias_str(name: str, k: int) -> str:
+    return name if k == 0 else f"{name}_{k}"
+
+def dump_dict(d: Dict[str, List[str]]) -> None:
+    """Pretty-print an adjacency dict.
+
+    orjson serializes in Rust and we write the bytes straight to stdout,
+    skipping pprint's recursive Python-level formatter; pprint stays as the
+    fallback when orjson is not installed.
+    """
+    if orjson is not None:
+        data = orjson.dumps(d, option=orjson.OPT_INDENT_2)
+        raw = getattr(sys.stdout, 'buffer', None)   # absent while batched
+        if raw is not None:
+            raw.write(data)
+        else:
+            sys.stdout.write(data.decode())
+        sys.stdout.write("\n")
+    else:
+        pprint(d)
+
+@contextmanager
+def batched_stdout():
+    """Collect everything printed inside the block, emit with one write().
+
+    The per-level bodies issue dozens of small print() calls, each a
+    separate stdout write (and flush on a TTY); batching turns that into a
+    single syscall per level.
+    """
+    buf = io.StringIO()
+    real, sys.stdout = sys.stdout, buf
+    try:
+        yield
+    finally:
+        sys.stdout = real
+        sys.stdout.write(buf.getvalue())
+
+###############################################################################
+# ─── 1.  CSR graph container ─────────────────────────────────────────────────
+###############################################################################
+class CSRGraph:
+    """Minimal CSR-backed digraph for the layering/transform hot path.
+
+    This module only ever needs successors, predecessors, in-degrees and a
+    per-node NodeData, so two (indptr, indices) int32 array pairs plus two
+    parallel lists replace networkx's dict-of-dicts: neighbor queries are
+    O(1) contiguous slices instead of hash-table walks. Node v is the
+    integer position of its name in ``names``.
+    """
+
+    __slots__ = ('names', 'node_data',
+                 'succ_indptr', 'succ_indices', 'pred_indptr', 'pred_indices')
+
+    def __init__(self, names: List[str], node_data: List[NodeData],
+                 src: np.ndarray, dst: np.ndarray):
+        n = len(names)
+        self.names = names
+        self.node_data = node_data
+
+        self.succ_indptr = np.zeros(n + 1, dtype=np.int32)
+        self.succ_indptr[1:] = np.cumsum(np.bincount(src, minlength=n))
+        self.succ_indices = dst[np.argsort(src, kind='stable')].astype(np.int32)
+
+        self.pred_indptr = np.zeros(n + 1, dtype=np.int32)
+        self.pred_indptr[1:] = np.cumsum(np.bincount(dst, minlength=n))
+        self.pred_indices = src[np.argsort(dst, kind='stable')].astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def successors(self, v: int) -> np.ndarray:
+        return self.succ_indices[self.succ_indptr[v]:self.succ_indptr[v + 1]]
+
+    def predecessors(self, v: int) -> np.ndarray:
+        return self.pred_indices[self.pred_indptr[v]:self.pred_indptr[v + 1]]
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Bridge for anything that still wants a real networkx graph."""
+        g = nx.DiGraph()
+        g.add_nodes_from((nm, {"data": nd})
+                         for nm, nd in zip(self.names, self.node_data))
+        g.add_edges_from((self.names[u], self.names[int(v)])
+                         for u in range(len(self.names))
+                         for v in self.successors(u))
+        return g
+
+
 ###############################################################################
-# ─── 1. random dependency graph (≈25 % density, reproducible) ────────────────
+# ─── 2. random dependency graph (≈25 % density, reproducible) ────────────────
 ###############################################################################
-def make_graph(n: int = 12, dens: float = 0.25, *, seed: int | None = None) -> nx.DiGraph:
+def make_graph(n: int = 12, dens: float = 0.25, *, seed: int | None = None) -> CSRGraph:
     """
     Generate a random directed dependency graph.
 
@@ -45,136 +188,216 @@ def make_graph(n: int = 12, dens: float = 0.25, *, seed: int | None = None) -> n
     n     : number of nodes
     dens  : edge-density target (≈ probability of any A→B edge)
     seed  : int | None
-        If an int is supplied, `random.seed(seed)` is called so the exact same
-        graph is produced every time you run the script with that seed.
-        If None (default) the graph is different on each run.
+        If an int is supplied, the same graph is produced every time you run
+        the script with that seed. If None (default) the graph is different
+        on each run.
     """
-    if seed is not None:
-        random.seed(seed)
-
-    g = nx.DiGraph()
+    rng = np.random.default_rng(seed)
 
-    # add nodes
-    for i in range(n):
-        nm = nth(i)
-        g.add_node(nm, data=NodeData(name=nm))
+    names = [nth(i) for i in range(n)]
 
-    # add edges  (A → B  ==  “B imports A”)
-    for s in g:
-        for d in g:
-            if s != d and random.random() < dens:
-                g.add_edge(s, d)
+    # edges  (A → B  ==  “B imports A”): one vectorized Bernoulli draw over
+    # the full n×n matrix instead of n² Python-level random() calls
+    mask = rng.random((n, n)) < dens
+    np.fill_diagonal(mask, False)
+    src, dst = np.nonzero(mask)
 
-    # ensure at least one root (in-degree 0)
-    if not [v for v in g if g.in_degree(v) == 0]:
-        v = random.choice(list(g))
-        g.remove_edges_from([(p, v) for p in list(g.predecessors(v))])
+    # ensure at least one root (in-degree 0) by clearing a random node's
+    # in-edges when every node has parents
+    if (np.bincount(dst, minlength=n) > 0).all():
+        v = rng.integers(n)
+        keep = dst != v
+        src, dst = src[keep], dst[keep]
 
-    return g
+    return CSRGraph(names, [NodeData(name=nm) for nm in names], src, dst)
 
 
 ###############################################################################
-# ─── 2.  adjacency helpers (parents vs. children) ────────────────────────────
+# ─── 2b.  adjacency views (parents vs. children) ─────────────────────────────
 ###############################################################################
-def children_dict(g) -> Dict[str, List[str]]:
-    return {g.nodes[v]['data'].name:       # current names
-            [g.nodes[c]['data'].name for c in g.successors(v)] for v in g}
+def children_dict(g: CSRGraph) -> Dict[str, List[str]]:
+    nd = g.node_data
+    return {nd[v].name:                        # current names
+            [nd[int(c)].name for c in g.successors(v)] for v in range(len(g))}
 
-def parents_dict(g) -> Dict[str, List[str]]:
-    return {g.nodes[v]['data'].name:
-            [g.nodes[p]['data'].name for p in g.predecessors(v)] for v in g}
+def parents_dict(g: CSRGraph) -> Dict[str, List[str]]:
+    nd = g.node_data
+    return {nd[v].name:
+            [nd[int(p)].name for p in g.predecessors(v)] for v in range(len(g))}
 
 
 ###############################################################################
 # ─── 3.  build levels using ONLY the parents view ────────────────────────────
 ###############################################################################
-def build_levels(g: nx.DiGraph) -> List[List[str]]:
-    """Kahn-style layering based on *parents* (in-edges)."""
-    indeg = {v: g.in_degree(v) for v in g}
-    level0 = [v for v, d in indeg.items() if d == 0]
-    levels: List[List[str]] = [level0.copy()]
+def build_levels(g: CSRGraph) -> List[List[Alias]]:
+    """Kahn-style layering based on *parents* (in-edges), O(V+E).
+
+    Works entirely on integer canon ids; returns levels of
+    (canon_id, alias_idx) pairs.
+    """
+    n = len(g)
+    succ_indptr, succ_indices = g.succ_indptr, g.succ_indices
+    indeg = np.diff(g.pred_indptr).astype(np.int32)
 
-    alias_cnt = defaultdict(int)                # canonical → alias counter
-    for v in level0: alias_cnt[v] = 1
+    level0 = [(i, 0) for i in range(n) if indeg[i] == 0]
+    levels: List[List[Alias]] = [level0.copy()]
+
+    alias_cnt = np.zeros(n, dtype=np.int32)     # canonical → alias counter
+    for cid, _ in level0: alias_cnt[cid] = 1
+
+    level_of = {a: 0 for a in level0}           # alias → level index
+    blocked = {i for i in range(n) if indeg[i] > 0}    # cycle-breaker pool
 
     queue = deque(level0)
     while queue:
         cur_alias = queue.popleft()
-        cur_can   = cur_alias.split('_')[0]
+        cid = cur_alias[0]
 
-        for child in g.successors(cur_can):     # downstream dependents
+        for child in succ_indices[succ_indptr[cid]:succ_indptr[cid + 1]].tolist():
             indeg[child] -= 1
             if indeg[child] == 0:
-                k = alias_cnt[child]
-                new_alias = child if k == 0 else f"{child}_{k}"
+                blocked.discard(child)
+                new_alias = (child, int(alias_cnt[child]))
                 alias_cnt[child] += 1
-                lvl_idx = max(idx for idx,l in enumerate(levels) if cur_alias in l) + 1
+                lvl_idx = level_of[cur_alias] + 1
                 if len(levels) <= lvl_idx:
                     levels.append([])
                 levels[lvl_idx].append(new_alias)
+                level_of[new_alias] = lvl_idx
                 queue.append(new_alias)
 
-        # cycle-breaker: if queue emptied but indeg not all 0
-        if not queue and any(d > 0 for d in indeg.values()):
-            stuck = next(v for v,d in indeg.items() if d > 0)
+        # cycle-breaker: if queue emptied but some nodes are still blocked
+        if not queue and blocked:
+            stuck = blocked.pop()
             indeg[stuck] = 0
-            alias_cnt[stuck] = 1 if alias_cnt[stuck]==0 else alias_cnt[stuck]
-            new_alias = stuck if alias_cnt[stuck]==1 else f"{stuck}_{alias_cnt[stuck]-1}"
+            if alias_cnt[stuck] == 0: alias_cnt[stuck] = 1
+            new_alias = (stuck, int(alias_cnt[stuck]) - 1)
             levels.append([new_alias])
+            level_of[new_alias] = len(levels) - 1
             queue.append(new_alias)
     return levels
 
 ###############################################################################
 # ─── 4.  per-level transform (driven by parents) ─────────────────────────────
 ###############################################################################
-def transform(levels, g):
-    current: Dict[str, str] = {}          # canonical → latest name
+def transform(levels, g: CSRGraph, verbose: bool = False):
+    # local aliases of the CSR arrays — everything below is indexed by the
+    # same integer ids build_levels used
+    nodes = g.names
+    n = len(nodes)
+    nd_map = g.node_data
+    succ_indptr, succ_indices = g.succ_indptr, g.succ_indices
+    pred_indptr, pred_indices = g.pred_indptr, g.pred_indices
+
+    # live name-keyed views, seeded once from the CSR arrays and patched in
+    # place on every rename — replaces the two full O(V+E) parents_dict /
+    # children_dict rebuilds after each level
+    parents_view: Dict[str, List[str]] = {
+        nd_map[i].name: [nd_map[p].name
+                         for p in pred_indices[pred_indptr[i]:pred_indptr[i + 1]].tolist()]
+        for i in range(n)
+    }
+    children_view: Dict[str, List[str]] = {
+        nd_map[i].name: [nd_map[c].name
+                         for c in succ_indices[succ_indptr[i]:succ_indptr[i + 1]].tolist()]
+        for i in range(n)
+    }
+
+    # SoA mirrors of the arithmetic state: names are parsed once here, the
+    # per-layer kernel then only touches flat int arrays (native code under
+    # numba, plain loop otherwise); strings are rebuilt from the arrays
+    alphas: List[str] = []
+    num = np.empty(n, dtype=np.int32)
+    alpha_upper = np.empty(n, dtype=np.uint8)
+    n_transforms = np.zeros(n, dtype=np.int32)
+    for i, nd in enumerate(nd_map):
+        a, d = _pat.fullmatch(nd.name).groups()
+        alphas.append(a.upper())
+        alpha_upper[i] = a.isupper()
+        num[i] = int(d)
+
+    def name_of(i: int) -> str:
+        return f"{alphas[i] if alpha_upper[i] else alphas[i].lower()}{num[i]}"
+
+    def fmt_state(i: int, state: int) -> str:
+        return f"{alphas[i] if state & 1 else alphas[i].lower()}{state >> 1}"
+
+    # latest *processed* name of every node, packed as num*2 | upper; the
+    # kernel bumps num/alpha_upper for a whole layer up front, so this lags
+    # until each node's bookkeeping below catches up
+    cur_state = (num * 2 + alpha_upper).astype(np.int32)
 
     for depth, layer in enumerate(levels):
-        print(f"\n--- TRANSFORMING LEVEL {depth} (|layer|={len(layer)}) ---")
-        for alias in layer:
-            canon = alias.split('_')[0]
-            nd = g.nodes[canon]['data']
-
-            old, new = nd.name, bump(nd.name)
-            nd.name, nd.n_transforms = new, nd.n_transforms + 1
-            nd.history.append(f"{old}→{new}")
-            current[canon] = new
-
-            # --- record direct-parent mapping (only for non-root levels) -------
-            if depth:
-                parent_pairs = []
-                for p in g.predecessors(canon):
-                    p_data = g.nodes[p]['data']
-                    # original name = first entry in history *if it exists*,
-                    # otherwise whatever the parent is currently called
-                    orig = (
-                        p_data.history[0].split('→')[0]
-                        if p_data.history else p_data.name
-                    )
-                    parent_pairs.append((orig, current.get(p, p_data.name)))
-                nd.parent_history.append(parent_pairs)
-
-            print(f"{alias:>10}: {old} → {new}")
-
-        print("\nparents view after level", depth)
-        pprint(parents_dict(g))
-        print("\nchildren view after level", depth)
-        pprint(children_dict(g))
-
+        with batched_stdout():
+            print(f"\n--- TRANSFORMING LEVEL {depth} (|layer|={len(layer)}) ---")
+            layer_idxs = np.fromiter((cid for cid, _ in layer),
+                                     dtype=np.int32, count=len(layer))
+            _bump_layer(layer_idxs, num, alpha_upper, n_transforms,
+                        np.random.default_rng(random.getrandbits(64)).random(len(layer)))
+
+            for cid, k in layer:
+                nd = nd_map[cid]
+
+                old_state = int(cur_state[cid])
+                old, new = fmt_state(cid, old_state), name_of(cid)
+                nd.name, nd.n_transforms = new, int(n_transforms[cid])
+                nd.history_num.append(old_state >> 1)
+                nd.history_case.append((old_state & 1) | (int(alpha_upper[cid]) << 1))
+                cur_state[cid] = int(num[cid]) * 2 + int(alpha_upper[cid])
+
+                # patch the live views: re-key this node and swap old→new in the
+                # neighbour lists that mention it
+                parents_view[new] = parents_view.pop(old)
+                children_view[new] = children_view.pop(old)
+                for c in succ_indices[succ_indptr[cid]:succ_indptr[cid + 1]].tolist():
+                    plist = parents_view[nd_map[c].name]
+                    plist[plist.index(old)] = new
+                for p in pred_indices[pred_indptr[cid]:pred_indptr[cid + 1]].tolist():
+                    clist = children_view[nd_map[p].name]
+                    clist[clist.index(old)] = new
+
+                # --- record direct-parent mapping (only for non-root levels) -------
+                if depth:
+                    # parent ids plus their packed name-state at record time;
+                    # the original names are just the canonical labels, so ids
+                    # are all dump() needs to rebuild the b→a pairs
+                    pids = pred_indices[pred_indptr[cid]:pred_indptr[cid + 1]]
+                    nd.parent_history.append((pids, cur_state[pids]))
+
+                print(f"{alias_str(nodes[cid], k):>10}: {old} → {new}")
+
+            # skip the full view dumps after trivially small levels — they
+            # repeat near-identical state; first and last levels always print
+            if (verbose or len(layer) >= max(4, n // 50)
+                    or depth in (0, len(levels) - 1)):
+                print("\nparents view after level", depth)
+                dump_dict(parents_view)
+                print("\nchildren view after level", depth)
+                dump_dict(children_view)
 
 ###############################################################################
 # ─── 5.  history dump ────────────────────────────────────────────────────────
 ###############################################################################
-def dump(g):
+def dump(g: CSRGraph):
+    """Materialize the array-backed histories into display strings."""
     print("\n===== FULL NODE HISTORIES =====")
-    for v in sorted(g):
-        nd = g.nodes[v]['data']
+    nodes = g.names
+    alpha_of = [_pat.fullmatch(v).group(1) for v in nodes]
+
+    def fmt(alpha: str, upper: int, n: int) -> str:
+        return f"{alpha if upper else alpha.lower()}{n}"
+
+    for i in sorted(range(len(g)), key=nodes.__getitem__):
+        v = nodes[i]
+        nd = g.node_data[i]
+        alpha = alpha_of[i]
+        history = [f"{fmt(alpha, c & 1, n)}→{fmt(alpha, c >> 1, n + 1)}"
+                   for n, c in zip(nd.history_num, nd.history_case)]
         print(f"{v}:")
-        print(f"   transforms ({nd.n_transforms}): {nd.history}")
-        for i, ph in enumerate(nd.parent_history,1):
+        print(f"   transforms ({nd.n_transforms}): {history}")
+        for i, (pids, states) in enumerate(nd.parent_history, 1):
             print(f"   step {i} parents: "
-                  f"{', '.join(f'{b}→{a}' for b,a in ph)}")
+                  f"{', '.join(f'{nodes[p]}→{fmt(alpha_of[p], s & 1, s >> 1)}' for p, s in zip(pids.tolist(), states.tolist()))}")
 
 
 ###############################################################################
@@ -186,19 +409,20 @@ if __name__ == "__main__":
     G = make_graph(12, .1, seed=42)
 
     print("\n=== ORIGINAL parents-dict (dependencies) ===")
-    pprint(parents_dict(G))
+    dump_dict(parents_dict(G))
     print("\n=== ORIGINAL children-dict (dependents) ===")
-    pprint(children_dict(G))
+    dump_dict(children_dict(G))
 
+    names = list(G)
     lvls = build_levels(G)
     for i,l in enumerate(lvls):
-        print(f"Level {i}: {', '.join(l)}")
+        print(f"Level {i}: {', '.join(alias_str(names[cid], k) for cid, k in l)}")
 
-    transform(lvls, G)
+    transform(lvls, G, verbose="--verbose" in sys.argv)
 
     print("\n=== FINAL parents-dict ===")
-    pprint(parents_dict(G))
+    dump_dict(parents_dict(G))
     print("\n=== FINAL children-dict ===")
-    pprint(children_dict(G))
+    dump_dict(children_dict(G))
 
     dump(G)
